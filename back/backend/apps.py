@@ -0,0 +1,28 @@
+"""
+App configuration for the audio visualizer backend.
+"""
+from django.apps import AppConfig
+from django.conf import settings
+import os
+import sys
+
+class BackendConfig(AppConfig):
+    name = 'backend'
+
+    def ready(self):
+        # Load the Whisper model when the server boots rather than on the first request.
+        # This is opt-in: every process that sets up Django (django-admin, shells, task
+        # workers, scripts) runs ready(), and only the web server should start a pool.
+        if settings.TRANSCRIPTION_PREWARM and not is_management_command():
+            from .views.transcription import warm_up_transcription_pool
+            warm_up_transcription_pool()
+
+def is_management_command():
+    """Return True for manage.py commands that don't serve requests, so a shared environment
+    with TRANSCRIPTION_PREWARM set doesn't start a pool for them."""
+    if os.path.basename(sys.argv[0]) != 'manage.py':
+        return False
+    if sys.argv[1:2] != ['runserver']:
+        return True
+    # The runserver autoreloader parent never handles requests; only its child does
+    return os.environ.get('RUN_MAIN') != 'true' and '--noreload' not in sys.argv
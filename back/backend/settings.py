@@ -39,6 +39,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'corsheaders',  # Add the CORS headers app
+    'backend',  # Starts the transcription workers at boot (see backend/apps.py)
 ]
 
 MIDDLEWARE = [
@@ -123,6 +124,33 @@ STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Cache (used for scraped podcast metadata); per-process by default,
+# point this at Redis to share entries between server workers
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Device for Whisper inference: "auto" uses CUDA (float16) when a GPU is visible, else CPU
+TRANSCRIPTION_DEVICE = os.environ.get('TRANSCRIPTION_DEVICE', 'auto')
+
+# CTranslate2 compute type: "auto" is float16 on CUDA and int8 on CPU
+# (e.g. set "int8_float16" to run int8 weights with float16 activations on a GPU)
+TRANSCRIPTION_COMPUTE_TYPE = os.environ.get('TRANSCRIPTION_COMPUTE_TYPE', 'auto')
+
+# Whisper inference runs in this many worker processes, each holding its own model
+# (0 means one per GPU on CUDA, otherwise one per CPU core). Every server worker
+# process starts its own pool, so divide the cores between them when running several.
+TRANSCRIPTION_WORKERS = int(os.environ.get('TRANSCRIPTION_WORKERS', 0))
+
+# Start the transcription workers (and load their models) when the server boots
+# instead of on the first transcription request. Off by default, since any process
+# that sets up Django would otherwise start a pool; enable it for the server only.
+TRANSCRIPTION_PREWARM = os.environ.get('TRANSCRIPTION_PREWARM', '0') == '1'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
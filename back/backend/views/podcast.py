@@ -4,19 +4,78 @@ Views related to podcast URL processing functionality.
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.conf import settings
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+import asyncio
+import contextlib
+import hashlib
+import html
 import os
 import json
-import time
 import subprocess
-import requests
+import uuid
+import weakref
+import httpx
 import re
+from lxml import etree
+from urllib.parse import urlparse
+
+try:
+    from yt_dlp import YoutubeDL
+except ImportError:
+    # Fall back to running youtube-dl as a subprocess
+    YoutubeDL = None
+
+APPLE_PODCASTS_HOST = 'podcasts.apple.com'
+
+# Page titles live in the <head>, so only this much of a page is requested
+TITLE_SEARCH_BYTES = 16384
+
+# Fallback for pages lxml can't find a <title> element in
+TITLE_PATTERN = re.compile(rb'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+
+# Have the downloader's ffmpeg write the mono 16 kHz audio Whisper consumes,
+# so transcription can read the samples without decoding the file again
+WHISPER_FFMPEG_ARGS = '-ac 1 -ar 16000'
+
+YT_DLP_OPTIONS = {
+    'format': 'bestaudio/best',
+    'postprocessors': [{'key': 'FFmpegExtractAudio', 'preferredcodec': 'wav'}],
+    'postprocessor_args': {'ffmpeg': WHISPER_FFMPEG_ARGS.split()},
+    'quiet': True,
+    'noprogress': True,
+}
+
+# How long scraped podcast metadata is reused for the same URL
+METADATA_CACHE_SECONDS = 60 * 60
 
 # Create media directory if it doesn't exist
 MEDIA_ROOT = os.path.join(settings.BASE_DIR, 'media')
 os.makedirs(MEDIA_ROOT, exist_ok=True)
 
+# Connection-pooled HTTP clients for long-lived ASGI event loops, one per loop
+_http_clients = weakref.WeakKeyDictionary()
+
+def new_http_client():
+    return httpx.AsyncClient(http2=True, timeout=5, follow_redirects=True)
+
+@contextlib.asynccontextmanager
+async def http_client(request):
+    """Yield an HTTP client for this request, closing it afterwards unless it can be pooled."""
+    if isinstance(request, ASGIRequest):
+        # Under ASGI the event loop outlives the request, so its client is reused
+        loop = asyncio.get_running_loop()
+        client = _http_clients.get(loop)
+        if client is None:
+            client = _http_clients[loop] = new_http_client()
+        yield client
+    else:
+        # Under WSGI every async view runs in its own event loop, so nothing can be pooled
+        async with new_http_client() as client:
+            yield client
+
 @csrf_exempt
-def process_podcast_url(request):
+async def process_podcast_url(request):
     """Process a podcast URL and return a URL to the downloaded audio file."""
     if request.method == 'POST':
         try:
@@ -28,15 +87,17 @@ def process_podcast_url(request):
                 return JsonResponse({"error": "No podcast URL provided"}, status=400)
             
             # Download the audio using youtube-dl or yt-dlp (which can handle podcast platforms too)
-            audio_path = download_podcast_audio(podcast_url)
+            # while fetching podcast metadata if available
+            async with http_client(request) as client:
+                audio_path, metadata = await asyncio.gather(
+                    download_podcast_audio(podcast_url),
+                    extract_podcast_metadata(podcast_url, client),
+                )
             
             # Get the URL path to the downloaded file
             file_name = os.path.basename(audio_path)
             file_url = f"/media/{file_name}"
             
-            # Get podcast metadata if available
-            metadata = extract_podcast_metadata(podcast_url)
-            
             return JsonResponse({
                 "audio_url": file_url,
                 "file_path": audio_path,
@@ -49,33 +110,19 @@ def process_podcast_url(request):
     
     return JsonResponse({"error": "Method not allowed"}, status=405)
 
-def download_podcast_audio(url):
+async def download_podcast_audio(url):
     """Download audio from podcast URL using youtube-dl or yt-dlp."""
     try:
-        # Create a temporary filename with random suffix
-        random_suffix = str(int(time.time()))
-        output_path = os.path.join(MEDIA_ROOT, f"podcast_{random_suffix}.mp3")
+        # Use a unique filename so concurrent downloads can't overwrite each other
+        output_base = os.path.join(MEDIA_ROOT, f"podcast_{uuid.uuid4().hex}")
+        output_path = f"{output_base}.wav"
         
-        # Try using yt-dlp first (newer and generally more reliable)
-        try:
-            subprocess.run([
-                'yt-dlp',
-                '-x',  # Extract audio
-                '--audio-format', 'mp3',
-                '--audio-quality', '0',  # Best quality
-                '-o', output_path,
-                url
-            ], check=True)
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            # Fall back to youtube-dl if yt-dlp is not available or fails
-            subprocess.run([
-                'youtube-dl',
-                '-x',  # Extract audio
-                '--audio-format', 'mp3',
-                '--audio-quality', '0',  # Best quality
-                '-o', output_path,
-                url
-            ], check=True)
+        # Use yt-dlp in-process (newer and generally more reliable), on a thread since it blocks
+        if YoutubeDL is not None:
+            await asyncio.to_thread(run_yt_dlp, url, output_base)
+        else:
+            # Fall back to youtube-dl if yt-dlp is not available
+            await run_downloader('youtube-dl', url, output_base, WHISPER_FFMPEG_ARGS)
         
         # Check if file exists and return the path
         if os.path.exists(output_path):
@@ -86,8 +133,36 @@ def download_podcast_audio(url):
     except Exception as e:
         raise Exception(f"Error downloading podcast: {str(e)}")
 
-def extract_podcast_metadata(url):
-    """Extract metadata from podcast URL."""
+def run_yt_dlp(url, output_base):
+    """Download and extract podcast audio with the yt-dlp library."""
+    # YoutubeDL instances aren't safe to share between threads, so each download gets its own
+    with YoutubeDL({**YT_DLP_OPTIONS, 'outtmpl': f'{output_base}.%(ext)s'}) as ydl:
+        ydl.download([url])
+
+async def run_downloader(program, url, output_base, postprocessor_args):
+    """Run youtube-dl as a subprocess without blocking the event loop."""
+    process = await asyncio.create_subprocess_exec(
+        program,
+        '-f', 'bestaudio/best',
+        '-x',  # Extract audio
+        '--audio-format', 'wav',
+        '--postprocessor-args', postprocessor_args,
+        '-o', f'{output_base}.%(ext)s',
+        url,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    _, stderr = await process.communicate()
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, program, stderr=stderr)
+
+async def extract_podcast_metadata(url, client):
+    """Extract metadata from podcast URL, reusing the cached result for a repeated URL."""
+    cache_key = f"podcast_metadata:{hashlib.sha256(url.encode()).hexdigest()}"
+    cached_metadata = await cache.aget(cache_key)
+    if cached_metadata is not None:
+        return cached_metadata
+    
     metadata = {
         "title": None,
         "publisher": None,
@@ -95,22 +170,46 @@ def extract_podcast_metadata(url):
     }
     
     # Extract information from Apple Podcasts URLs
-    if "podcasts.apple.com" in url:
+    host = urlparse(url).hostname or ''
+    if host == APPLE_PODCASTS_HOST or host.endswith('.' + APPLE_PODCASTS_HOST):
         try:
-            # Make a request to the URL
-            response = requests.get(url)
-            if response.status_code == 200:
-                # Extract title from HTML
-                title_match = re.search(r'<title>(.*?)</title>', response.text)
-                if title_match:
-                    title_parts = title_match.group(1).split(' - ')
-                    if len(title_parts) >= 2:
-                        metadata["episode"] = title_parts[0]
-                        metadata["title"] = title_parts[1]
-                        if len(title_parts) >= 3:
-                            metadata["publisher"] = title_parts[2]
+            title = await fetch_page_title(url, client)
+            if title:
+                title_parts = title.split(' - ')
+                if len(title_parts) >= 2:
+                    metadata["episode"] = title_parts[0]
+                    metadata["title"] = title_parts[1]
+                    if len(title_parts) >= 3:
+                        metadata["publisher"] = title_parts[2]
+                
+                # Only cache pages that returned a title, so an error response isn't remembered
+                await cache.aset(cache_key, metadata, METADATA_CACHE_SECONDS)
         except:
             # If extraction fails, just continue with empty metadata
             pass
     
-    return metadata
\ No newline at end of file
+    return metadata
+
+async def fetch_page_title(url, client):
+    """Stream the head of a page and return its <title>, stopping as soon as the element is parsed."""
+    headers = {'Range': f'bytes=0-{TITLE_SEARCH_BYTES - 1}'}
+    async with client.stream('GET', url, headers=headers) as response:
+        # Servers that ignore the Range header answer 200 with the full page
+        if response.status_code not in (200, 206):
+            return None
+        
+        parser = etree.HTMLPullParser(events=('end',), tag='title')
+        body = b''
+        async for chunk in response.aiter_bytes(chunk_size=8192):
+            parser.feed(chunk)
+            for _, element in parser.read_events():
+                return element.text
+            body += chunk
+            if len(body) >= TITLE_SEARCH_BYTES:
+                break
+        
+        # lxml didn't report a title in the head of the page; fall back to a regex over the raw bytes
+        title_match = TITLE_PATTERN.search(body)
+        if not title_match:
+            return None
+        return html.unescape(title_match.group(1).decode(response.encoding or 'utf-8', errors='replace'))
\ No newline at end of file
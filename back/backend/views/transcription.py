@@ -3,12 +3,368 @@ Views related to audio transcription functionality.
 """
 from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
+from django.conf import settings
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import deque
+import gc
+import math
+import multiprocessing
 import os
 import tempfile
-import whisper
+import threading
+import wave
+import ctranslate2
 import json
 import ffmpeg
-from typing import Iterator
+import numpy as np
+import orjson
+from faster_whisper import BatchedInferencePipeline, WhisperModel
+from faster_whisper.vad import VadOptions, get_speech_timestamps
+from typing import Iterator, Optional
+
+# Smallest Whisper model, for speed
+MODEL_SIZE = "tiny"
+
+# Whisper models expect 16 kHz mono audio
+SAMPLE_RATE = 16000
+
+# Seconds of new audio handed to the streaming processor per iteration
+MIN_CHUNK_SECONDS = 10
+
+# Longest stretch of audio the streaming processor holds; past this the oldest
+# pending words are committed without waiting for a second pass to agree
+MAX_BUFFER_SECONDS = 45
+
+# Characters of committed transcript passed back to Whisper as context
+PROMPT_CHARS = 200
+
+SENTENCE_ENDINGS = ('.', '?', '!')
+
+# Whole files are split into chunks of this many seconds for progress events
+FILE_CHUNK_SECONDS = 30
+
+# Whisper windows batched together through the encoder, and the audio handed to each
+# batched job (one job per pool worker at a time)
+BATCH_SIZE = 8
+BATCH_WINDOW_SECONDS = FILE_CHUNK_SECONDS * BATCH_SIZE
+
+# MP4-family containers may keep their index at the end of the file, so ffmpeg
+# can only decode them from a seekable file rather than a pipe
+SEEK_REQUIRED_EXTENSIONS = ('.mp4', '.m4a', '.m4b', '.mov', '.3gp')
+SEEK_REQUIRED_CONTENT_TYPES = ('audio/mp4', 'audio/m4a', 'audio/x-m4a', 'video/mp4', 'video/quicktime', 'audio/3gpp', 'video/3gpp')
+
+# Silero VAD settings shared by the chunk gate and faster-whisper's own filter
+VAD_PARAMETERS = {"min_silence_duration_ms": 500}
+
+class WhisperManager:
+    """Keep a single Whisper model in memory for the lifetime of the worker."""
+
+    _model: Optional[WhisperModel] = None
+    _model_size = None
+    _device = None
+    _device_index = None
+    _compute_type = None
+    _cpu_threads = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_model(
+        cls,
+        model_size: str = MODEL_SIZE,
+        device: Optional[str] = None,
+        device_index: int = 0,
+        compute_type: Optional[str] = None,
+        cpu_threads: int = 0,
+    ) -> WhisperModel:
+        """Return the cached model, loading it only when the requested config changes."""
+        if device is None:
+            device = detect_device()
+        if compute_type is None:
+            compute_type = detect_compute_type(device)
+
+        with cls._lock:
+            config = (model_size, device, device_index, compute_type, cpu_threads)
+            current = (cls._model_size, cls._device, cls._device_index, cls._compute_type, cls._cpu_threads)
+            if cls._model is None or current != config:
+                cls._unload()
+                cls._model = WhisperModel(
+                    model_size,
+                    device=device,
+                    device_index=device_index,
+                    compute_type=compute_type,
+                    cpu_threads=cpu_threads,
+                )
+                (cls._model_size, cls._device, cls._device_index,
+                 cls._compute_type, cls._cpu_threads) = config
+            return cls._model
+
+    @classmethod
+    def unload(cls):
+        """Release the cached model so the next request reloads it."""
+        with cls._lock:
+            cls._unload()
+
+    @classmethod
+    def _unload(cls):
+        if cls._model is None:
+            return
+        del cls._model
+        cls._model = None
+        cls._model_size = None
+        cls._device = None
+        cls._device_index = None
+        cls._compute_type = None
+        cls._cpu_threads = None
+        gc.collect()
+
+def detect_device() -> str:
+    """Return the configured inference device, preferring CUDA when set to auto."""
+    if settings.TRANSCRIPTION_DEVICE != "auto":
+        return settings.TRANSCRIPTION_DEVICE
+    return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+
+def detect_compute_type(device: str) -> str:
+    """Return the configured quantization: float16 on the GPU, int8 kernels on the CPU by default."""
+    if settings.TRANSCRIPTION_COMPUTE_TYPE != "auto":
+        return settings.TRANSCRIPTION_COMPUTE_TYPE
+    return "float16" if device == "cuda" else "int8"
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_size = 0
+_pool_lock = threading.Lock()
+
+# Model settings of the current pool worker process, filled in by _init_worker
+_worker_model_config = {}
+
+def get_transcription_pool() -> ProcessPoolExecutor:
+    """Return the shared pool of worker processes that run Whisper inference."""
+    global _pool, _pool_size
+    with _pool_lock:
+        if _pool is None:
+            device = detect_device()
+            gpu_count = ctranslate2.get_cuda_device_count() if device == "cuda" else 0
+            
+            # One worker per GPU keeps each card to a single model; otherwise one per core
+            cpu_count = os.cpu_count() or 1
+            workers = settings.TRANSCRIPTION_WORKERS or gpu_count or cpu_count
+            
+            # Split the cores between workers so their CPU kernels don't oversubscribe the machine
+            cpu_threads = max(1, cpu_count // workers)
+            
+            mp_context = multiprocessing.get_context("spawn")
+            _pool_size = workers
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=mp_context,
+                initializer=_init_worker,
+                initargs=(MODEL_SIZE, device, gpu_count, cpu_threads, mp_context.Value('i', 0)),
+            )
+        return _pool
+
+def warm_up_transcription_pool():
+    """Start every pool worker now so each has its model loaded before the first request."""
+    get_transcription_pool()
+    # The executor spawns a new worker for each job submitted while none is idle
+    for _ in range(_pool_size):
+        _submit(_warm_up_worker)
+
+def submit_transcription(audio: np.ndarray, batched: bool = False, **options) -> Future:
+    """Queue audio on the worker pool; the future resolves to its segments as plain dicts."""
+    return _submit(_transcribe_in_worker, audio, batched, options)
+
+def transcribe(audio: np.ndarray, **options) -> list:
+    """Transcribe audio on the worker pool and return its segments as plain dicts."""
+    return submit_transcription(audio, **options).result()
+
+def _submit(fn, *args) -> Future:
+    pool = get_transcription_pool()
+    try:
+        future = pool.submit(fn, *args)
+    except BrokenProcessPool:
+        # A worker died while the pool was idle; replace the pool and try once more
+        _discard_pool(pool)
+        pool = get_transcription_pool()
+        future = pool.submit(fn, *args)
+    future.add_done_callback(lambda f: _discard_broken_pool(pool, f))
+    return future
+
+def _discard_broken_pool(pool: ProcessPoolExecutor, future: Future):
+    if future.cancelled() or not isinstance(future.exception(), BrokenProcessPool):
+        return
+    # A worker died (e.g. out of memory) or failed to load the model;
+    # start a fresh pool for the next request
+    _discard_pool(pool)
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def _init_worker(model_size: str, device: str, gpu_count: int, cpu_threads: int, worker_counter):
+    # Spread workers round-robin across the visible GPUs
+    device_index = 0
+    if gpu_count:
+        with worker_counter.get_lock():
+            device_index = worker_counter.value % gpu_count
+            worker_counter.value += 1
+    
+    # Load the model once per worker process, before it accepts any jobs
+    _worker_model_config.update(
+        model_size=model_size,
+        device=device,
+        device_index=device_index,
+        cpu_threads=cpu_threads,
+    )
+    WhisperManager.get_model(**_worker_model_config)
+
+def _warm_up_worker():
+    # The model was already loaded by _init_worker; nothing else to do
+    pass
+
+def _transcribe_in_worker(audio: np.ndarray, batched: bool, options: dict) -> list:
+    model = WhisperManager.get_model(**_worker_model_config)
+    if batched:
+        # Batch the 30 s windows of a long clip through the encoder together
+        model = BatchedInferencePipeline(model=model)
+    segments_iter, info = model.transcribe(audio, **options)
+    
+    # Consume the lazy Segment generator here so only plain data crosses the process boundary
+    segments = []
+    for segment in segments_iter:
+        segments.append({
+            "id": segment.id,
+            "text": segment.text,
+            "start": segment.start,
+            "end": segment.end,
+            "words": [
+                {"word": word.word, "start": word.start, "end": word.end}
+                for word in segment.words or []
+            ]
+        })
+    return segments
+
+class OnlineASRProcessor:
+    """
+    Rolling-buffer transcriber using the LocalAgreement-2 policy from whisper_streaming.
+
+    Each pass re-transcribes the audio since the last confirmed word and only
+    commits the words that agree with the previous pass, so words cut at a chunk
+    boundary are never emitted before Whisper has heard the rest of them.
+    """
+
+    def __init__(self):
+        self.audio_buffer = np.zeros(0, dtype=np.float32)
+        self.buffer_time_offset = 0.0
+        self.last_confirmed_ts = 0.0
+        self.prev_hypothesis = []
+        self.committed_text = ""
+
+    def insert_audio_chunk(self, audio: np.ndarray):
+        """Append newly available audio to the buffer."""
+        self.audio_buffer = np.concatenate([self.audio_buffer, audio])
+
+    def skip_audio_chunk(self, audio: np.ndarray):
+        """Advance past a chunk without speech instead of buffering it."""
+        self.buffer_time_offset += (len(self.audio_buffer) + len(audio)) / SAMPLE_RATE
+        self.audio_buffer = np.zeros(0, dtype=np.float32)
+
+    def process_iter(self) -> list:
+        """Transcribe the buffer and return the newly committed words."""
+        hypothesis = self._transcribe_buffer()
+        
+        # Commit the longest common prefix of this pass and the previous one
+        committed = []
+        for prev_word, word in zip(self.prev_hypothesis, hypothesis):
+            if _normalize_word(prev_word["word"]) != _normalize_word(word["word"]):
+                break
+            committed.append(word)
+        
+        self.prev_hypothesis = hypothesis[len(committed):]
+        self._commit(committed)
+        return committed + self._enforce_buffer_cap()
+
+    def finish(self) -> list:
+        """Commit the remaining hypothesis once no more audio will arrive."""
+        committed = self.prev_hypothesis
+        self.prev_hypothesis = []
+        self._commit(committed)
+        return committed
+
+    def _transcribe_buffer(self) -> list:
+        segments = transcribe(
+            self.audio_buffer,
+            word_timestamps=True,
+            vad_filter=True,
+            vad_parameters=VAD_PARAMETERS,
+            initial_prompt=self.committed_text[-PROMPT_CHARS:] or None,
+        )
+        
+        # Shift word timestamps from buffer time to overall position in the audio
+        # (the worker's dicts are fresh copies, so they can be updated in place)
+        words = []
+        for segment in segments:
+            for word in segment["words"]:
+                word["start"] += self.buffer_time_offset
+                word["end"] += self.buffer_time_offset
+            words.extend(segment["words"])
+        return words
+
+    def _enforce_buffer_cap(self) -> list:
+        """Keep the buffer within MAX_BUFFER_SECONDS, returning any words force-committed to do so."""
+        buffer_end = self.buffer_time_offset + len(self.audio_buffer) / SAMPLE_RATE
+        keep_from = buffer_end - MAX_BUFFER_SECONDS
+        if keep_from <= self.buffer_time_offset:
+            return []
+        
+        # Commit the pending words that end before the part of the buffer being kept
+        forced = []
+        for word in self.prev_hypothesis:
+            if word["end"] > keep_from:
+                break
+            forced.append(word)
+        self.prev_hypothesis = self.prev_hypothesis[len(forced):]
+        self._commit(forced)
+        
+        if forced:
+            return forced
+
+        # With no words to cut at, drop the oldest audio outright,
+        # but never past the start of a word that's still pending
+        cut_at = keep_from
+        if self.prev_hypothesis:
+            cut_at = min(cut_at, self.prev_hypothesis[0]["start"])
+        if cut_at > self.buffer_time_offset:
+            self._trim_buffer(cut_at)
+        elif self.prev_hypothesis:
+            # The pending word starts at the very front of the buffer, so commit it to make room
+            forced = self.prev_hypothesis[:1]
+            self.prev_hypothesis = self.prev_hypothesis[1:]
+            self._commit(forced)
+        return forced
+
+    def _commit(self, words: list):
+        if not words:
+            return
+        self.committed_text += "".join(word["word"] for word in words)
+        self.last_confirmed_ts = words[-1]["end"]
+        
+        # Drop the audio already materialized into transcript
+        self._trim_buffer(self.last_confirmed_ts)
+
+    def _trim_buffer(self, timestamp: float):
+        drop_samples = int((timestamp - self.buffer_time_offset) * SAMPLE_RATE)
+        self.audio_buffer = self.audio_buffer[max(drop_samples, 0):]
+        self.buffer_time_offset = timestamp
+
+def has_speech(audio: np.ndarray) -> bool:
+    """Run Silero VAD over a chunk and report whether it contains any speech."""
+    return bool(get_speech_timestamps(audio, VadOptions(**VAD_PARAMETERS)))
+
+def _normalize_word(word: str) -> str:
+    return word.strip().lower().strip('.,!?;:"\'')
 
 @csrf_exempt
 def transcribe_audio(request):
@@ -16,26 +372,16 @@ def transcribe_audio(request):
     if request.method == 'POST' and request.FILES.get('audio_file'):
         audio_file = request.FILES['audio_file']
         
-        # Create a temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(audio_file.name)[1]) as temp_file:
-            # Write uploaded file content to the temp file
-            for chunk in audio_file.chunks():
-                temp_file.write(chunk)
-            temp_path = temp_file.name
-        
         try:
             # Use StreamingHttpResponse to send chunks of transcription as they're processed
             response = StreamingHttpResponse(
-                streaming_transcribe(temp_path),
+                transcribe_upload(audio_file),
                 content_type='text/event-stream'
             )
             response["Cache-Control"] = "no-cache"
             response["X-Accel-Buffering"] = "no"
             return response
         except Exception as e:
-            # Clean up the temporary file if there's an error
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
             # If there's an error, return the error message
             return JsonResponse({"error": f"Error transcribing audio: {str(e)}"}, status=500)
     return JsonResponse({"error": "Invalid request."}, status=400)
@@ -54,7 +400,7 @@ def transcribe_podcast_file(request):
             
             # Use StreamingHttpResponse to send chunks of transcription as they're processed
             response = StreamingHttpResponse(
-                streaming_transcribe(file_path, delete_on_complete=False),
+                transcribe_file(file_path),
                 content_type='text/event-stream'
             )
             response["Cache-Control"] = "no-cache"
@@ -65,93 +411,302 @@ def transcribe_podcast_file(request):
             return JsonResponse({"error": f"Error transcribing podcast: {str(e)}"}, status=500)
     return JsonResponse({"error": "Invalid request."}, status=400)
 
-def streaming_transcribe(audio_path: str, delete_on_complete=True) -> Iterator[str]:
-    """Stream audio transcription in chunks."""
+def transcribe_upload(audio_file) -> Iterator[bytes]:
+    """Decode an upload with ffmpeg as it is read and stream its transcription."""
+    # Uploads Django already spooled to disk are read in place; containers that need
+    # seeking are spooled to a temporary file; anything else is piped through ffmpeg's stdin
+    temp_path = None
+    process = None
+    try:
+        if hasattr(audio_file, 'temporary_file_path'):
+            input_path = audio_file.temporary_file_path()
+        elif needs_seekable_input(audio_file):
+            with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(audio_file.name)[1]) as temp_file:
+                temp_path = temp_file.name
+                for chunk in audio_file.chunks():
+                    temp_file.write(chunk)
+            input_path = temp_path
+        else:
+            input_path = None
+        
+        process = (
+            ffmpeg
+            .input(input_path or 'pipe:')
+            .output('pipe:', format='f32le', ac=1, ar=SAMPLE_RATE)
+            .global_args('-loglevel', 'error', '-nostats')
+            .run_async(pipe_stdin=True, pipe_stdout=True, pipe_stderr=True)
+        )
+        read_stderr = collect_stderr(process)
+        
+        def pump_upload():
+            try:
+                if input_path is None:
+                    for chunk in audio_file.chunks():
+                        process.stdin.write(chunk)
+            except BrokenPipeError:
+                # ffmpeg exited early; its error is reported from stderr below
+                pass
+            finally:
+                process.stdin.close()
+        
+        threading.Thread(target=pump_upload, daemon=True).start()
+        
+        yield from streaming_transcribe(read_audio_chunks(process.stdout))
+        if process.wait() != 0:
+            error = read_stderr().decode(errors='replace').strip()
+            yield sse_event({'error': f'Error decoding audio: {error}'})
+    except Exception as e:
+        # Return error as event
+        yield sse_event({'error': str(e)})
+    finally:
+        if process is not None and process.poll() is None:
+            process.kill()
+            process.wait()
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def needs_seekable_input(audio_file) -> bool:
+    """Return True for MP4-family uploads, whose index (moov atom) may sit at the end of the file."""
+    extension = os.path.splitext(audio_file.name or '')[1].lower()
+    return extension in SEEK_REQUIRED_EXTENSIONS or audio_file.content_type in SEEK_REQUIRED_CONTENT_TYPES
+
+def collect_stderr(process):
+    """Drain a subprocess's stderr on a thread so it can't block on a full pipe; returns a reader."""
+    output = []
+    thread = threading.Thread(target=lambda: output.extend(process.stderr), daemon=True)
+    thread.start()
     
-    # Load Whisper model (using the smallest model for speed)
-    model = whisper.load_model("tiny")
+    def read_stderr() -> bytes:
+        thread.join()
+        return b''.join(output)
+    return read_stderr
+
+def transcribe_file(audio_path: str) -> Iterator[bytes]:
+    """Stream the transcription of an audio file on disk."""
+    windows = read_audio_file(audio_path, BATCH_WINDOW_SECONDS)
+    pending = deque()
     
     try:
-        # Get audio duration using ffprobe
-        probe = ffmpeg.probe(audio_path)
-        duration = float(probe['format']['duration'])
-        
-        # Define chunk size in seconds (e.g., process 30 seconds at a time)
-        chunk_duration = 30
-        total_chunks = int(duration / chunk_duration) + 1
-        
-        # Process audio in chunks
-        for i in range(total_chunks):
-            start_time = i * chunk_duration
-            end_time = min(start_time + chunk_duration, duration)
-            
-            # Skip processing if this is the last chunk and it's too short
-            if end_time - start_time < 1.0 and i > 0:
-                continue
-            
-            try:
-                # Extract audio segment using ffmpeg
-                segment_path = f"{audio_path}_segment_{i}.wav"
-                (
-                    ffmpeg
-                    .input(audio_path, ss=start_time, to=end_time)
-                    .output(segment_path)
-                    .run(quiet=True, overwrite_output=True)
-                )
-                
-                # Transcribe the segment
-                result = model.transcribe(
-                    segment_path, 
+        duration = probe_duration(audio_path)
+        total_chunks = max(1, math.ceil(duration / FILE_CHUNK_SECONDS)) if duration else None
+        
+        # The whole file is known up front, so there are no chunk boundaries to agree on:
+        # transcribe its windows in parallel across the pool and report them in order.
+        # Only a few windows are read ahead of the results, so memory doesn't grow with file length.
+        get_transcription_pool()
+        max_in_flight = _pool_size + 1
+        
+        window = next(windows, None)
+        if window is None:
+            yield sse_event(build_chunk_response(0, total_chunks, [], True))
+            return
+        
+        index = 0
+        while window is not None or pending:
+            while window is not None and len(pending) < max_in_flight:
+                future = submit_transcription(
+                    window,
+                    batched=True,
+                    batch_size=BATCH_SIZE,
                     word_timestamps=True,
+                    vad_parameters=VAD_PARAMETERS,
                 )
-                
-                # Adjust segment timestamps to account for the overall position in the audio
-                segments = []
-                for segment in result["segments"]:
-                    adjusted_segment = {
-                        "id": f"{i}-{segment['id']}",  # Make IDs unique across chunks
-                        "text": segment["text"],
-                        "start": segment["start"] + start_time,
-                        "end": segment["end"] + start_time
-                    }
+                pending.append((index, len(window), future))
+                window = next(windows, None)
+                index += 1
+            
+            window_index, window_samples, future = pending.popleft()
+            is_last_window = window is None and not pending
+            yield from _window_events(window_index, window_samples, future, total_chunks, is_last_window)
+            
+    except ffmpeg.Error as e:
+        error = e.stderr.decode(errors='replace').strip()
+        yield sse_event({'error': f'Error decoding audio: {error}'})
+    except Exception as e:
+        # Return error as event
+        yield sse_event({'error': str(e)})
+    finally:
+        # Don't leave windows queued on the pool if the client went away
+        for _, _, future in pending:
+            future.cancel()
+        windows.close()
+
+def _window_events(
+    index: int, window_samples: int, future: Future, total_chunks: Optional[int], is_last_window: bool
+) -> Iterator[bytes]:
+    window_offset = index * BATCH_WINDOW_SECONDS
+    first_chunk_id = index * (BATCH_WINDOW_SECONDS // FILE_CHUNK_SECONDS)
+    last_chunk_id = first_chunk_id + math.ceil(window_samples / (FILE_CHUNK_SECONDS * SAMPLE_RATE)) - 1
+    
+    try:
+        window_segments = future.result()
+    except Exception as e:
+        error_msg = f"Error processing chunks {first_chunk_id}-{last_chunk_id}: {str(e)}"
+        yield sse_event({'error': error_msg})
+        return
+    
+    # Adjust segment timestamps to account for the overall position in the audio
+    # and group them into the chunk their start time falls in
+    chunk_segments = {}
+    for segment in window_segments:
+        segment["start"] += window_offset
+        segment["end"] += window_offset
+        for word in segment["words"]:
+            word["start"] += window_offset
+            word["end"] += window_offset
+        
+        chunk_id = min(int(segment["start"] // FILE_CHUNK_SECONDS), last_chunk_id)
+        chunk_segments.setdefault(chunk_id, []).append(segment)
+    
+    for chunk_id in range(first_chunk_id, last_chunk_id + 1):
+        segments = chunk_segments.get(chunk_id, [])
+        for n, segment in enumerate(segments):
+            segment["id"] = f"{chunk_id}-{n}"  # Make IDs unique across chunks
+        
+        chunk_response = {
+            "chunk_id": chunk_id,
+            # The probed duration is approximate, so never report fewer chunks than were sent
+            "total_chunks": max(total_chunks, chunk_id + 1) if total_chunks else None,
+            "chunk_text": "".join(segment["text"] for segment in segments).strip(),
+            "segments": segments,
+            "is_final": is_last_window and chunk_id == last_chunk_id
+        }
+        yield sse_event(chunk_response)
+
+def probe_duration(audio_path: str) -> Optional[float]:
+    """Return the length of an audio file in seconds, or None if the container doesn't say."""
+    wav = open_pcm_wav(audio_path)
+    if wav is not None:
+        with wav:
+            return wav.getnframes() / SAMPLE_RATE
+    
+    try:
+        return float(ffmpeg.probe(audio_path)['format']['duration'])
+    except (KeyError, ValueError):
+        return None
+
+def read_audio_file(audio_path: str, chunk_seconds: int) -> Iterator[np.ndarray]:
+    """Yield a file's mono 16 kHz float32 samples chunk by chunk, without holding the whole file."""
+    # Downloaded podcasts are already 16 kHz mono PCM, so there's nothing to decode
+    wav = open_pcm_wav(audio_path)
+    if wav is not None:
+        with wav:
+            while True:
+                frames = wav.readframes(chunk_seconds * SAMPLE_RATE)
+                if not frames:
+                    return
+                yield np.frombuffer(frames, np.int16).astype(np.float32) / 32768.0
+    
+    process = (
+        ffmpeg
+        .input(audio_path)
+        .output('pipe:', format='f32le', ac=1, ar=SAMPLE_RATE)
+        .global_args('-loglevel', 'error', '-nostats')
+        .run_async(pipe_stdout=True, pipe_stderr=True)
+    )
+    read_stderr = collect_stderr(process)
+    try:
+        yield from read_audio_chunks(process.stdout, chunk_seconds)
+        if process.wait() != 0:
+            raise ffmpeg.Error('ffmpeg', None, read_stderr())
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+
+def open_pcm_wav(audio_path: str) -> Optional[wave.Wave_read]:
+    """Open a 16 kHz mono 16-bit WAV file for direct reading, or return None for any other file."""
+    try:
+        wav = wave.open(audio_path, 'rb')
+    except (wave.Error, EOFError):
+        return None
+    if (wav.getframerate(), wav.getnchannels(), wav.getsampwidth()) != (SAMPLE_RATE, 1, 2):
+        wav.close()
+        return None
+    return wav
+
+def read_audio_chunks(pcm_stream, chunk_seconds: int = MIN_CHUNK_SECONDS) -> Iterator[np.ndarray]:
+    """Read chunks of float32 samples from a raw PCM stream until EOF."""
+    chunk_bytes = chunk_seconds * SAMPLE_RATE * 4
+    while True:
+        data = pcm_stream.read(chunk_bytes)
+        if not data:
+            return
+        yield np.frombuffer(data[:len(data) - len(data) % 4], np.float32)
+
+def streaming_transcribe(audio_chunks: Iterator[np.ndarray]) -> Iterator[bytes]:
+    """Stream the transcription of mono 16 kHz audio arriving in chunks."""
+    processor = OnlineASRProcessor()
+    
+    def prepare_chunk():
+        chunk = next(audio_chunks, None)
+        return chunk, chunk is not None and has_speech(chunk)
+    
+    try:
+        # Read and VAD the next chunk on a helper thread while Whisper works on the current one
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            chunk, speech = prefetcher.submit(prepare_chunk).result()
+            chunk_id = 0
+            
+            while chunk is not None:
+                next_chunk = prefetcher.submit(prepare_chunk)
+                try:
+                    # Whisper hallucinates text on silence, so only transcribe chunks with speech
+                    # (or with a pending hypothesis that still needs confirming)
+                    if processor.prev_hypothesis or speech:
+                        processor.insert_audio_chunk(chunk)
+                        words = processor.process_iter()
+                    else:
+                        processor.skip_audio_chunk(chunk)
+                        words = []
                     
-                    # Include word-level timestamps if available
-                    if "words" in segment and segment["words"]:
-                        adjusted_segment["words"] = [
-                            {
-                                "word": word.get("word", ""),
-                                "start": word.get("start", 0) + start_time,
-                                "end": word.get("end", 0) + start_time
-                            } 
-                            for word in segment["words"]
-                        ]
-                    segments.append(adjusted_segment)
-                
-                # Clean up the temporary segment file
-                if os.path.exists(segment_path):
-                    os.remove(segment_path)
-                
-                # Create response with chunk info and segments
-                chunk_response = {
-                    "chunk_id": i,
-                    "total_chunks": total_chunks,
-                    "chunk_text": result["text"],
-                    "segments": segments,
-                    "is_final": (i == total_chunks - 1)
-                }
-                
-                # Yield the chunk data as a Server-Sent Event
-                yield f"data: {json.dumps(chunk_response)}\n\n"
+                    # Nothing follows the last chunk, so flush the pending hypothesis
+                    chunk, speech = next_chunk.result()
+                    is_final = chunk is None
+                    if is_final:
+                        words += processor.finish()
+                    
+                    # Yield the newly committed words as a Server-Sent Event
+                    chunk_response = build_chunk_response(chunk_id, None, words, is_final)
+                    yield sse_event(chunk_response)
+                    
+                except Exception as e:
+                    # Return error for this chunk
+                    error_msg = f"Error processing chunk {chunk_id}: {str(e)}"
+                    yield sse_event({'error': error_msg})
+                    chunk, speech = next_chunk.result()
                 
-            except Exception as e:
-                # Return error for this chunk
-                error_msg = f"Error processing chunk {i}: {str(e)}"
-                yield f"data: {json.dumps({'error': error_msg})}\n\n"
+                chunk_id += 1
                 
     except Exception as e:
         # Return error as event
-        yield f"data: {json.dumps({'error': str(e)})}\n\n"
-    finally:
-        # Clean up the temporary file if requested
-        if delete_on_complete and os.path.exists(audio_path):
-            os.remove(audio_path)
\ No newline at end of file
+        yield sse_event({'error': str(e)})
+
+def sse_event(payload: dict) -> bytes:
+    """Encode a payload as a Server-Sent Event."""
+    return b"data: " + orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n\n"
+
+def build_chunk_response(chunk_id: int, total_chunks: Optional[int], words: list, is_final: bool) -> dict:
+    """Group committed words into sentence segments in the shape the frontend expects."""
+    segments = []
+    current = []
+    for word in words:
+        current.append(word)
+        # Close the segment at the end of a sentence or of the committed words
+        if word["word"].rstrip().endswith(SENTENCE_ENDINGS) or word is words[-1]:
+            segments.append({
+                "id": f"{chunk_id}-{len(segments)}",
+                "text": "".join(w["word"] for w in current),
+                "start": current[0]["start"],
+                "end": current[-1]["end"],
+                "words": current
+            })
+            current = []
+    
+    return {
+        "chunk_id": chunk_id,
+        "total_chunks": total_chunks,
+        "chunk_text": "".join(w["word"] for w in words).strip(),
+        "segments": segments,
+        "is_final": is_final
+    }
@@ -162,8 +162,12 @@ function App() {
               return;
             }
             
-            // Update progress
-            setProgress(Math.round((data.chunk_id + 1) / data.total_chunks * 100));
+            // Update progress (uploads are decoded as they stream in, so their length is unknown)
+            if (data.total_chunks) {
+              setProgress(Math.round((data.chunk_id + 1) / data.total_chunks * 100));
+            } else if (data.is_final) {
+              setProgress(100);
+            }
             
             // Add chunk_id to each segment for easier lookup later
             const segmentsWithChunkId = data.segments.map(segment => ({